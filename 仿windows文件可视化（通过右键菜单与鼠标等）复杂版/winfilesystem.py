@@ -1,48 +1,107 @@
+import posixpath
 import sys
+from bisect import bisect_left
+from collections import deque
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
 FILENAME_LEN = 256
+HISTORY_LEN = 128
+NODE_POOL_SIZE = 4096
+
+_NODE_POOL = []
 
 class FileNode:
+    __slots__ = ('name', 'isdir', 'parent', 'children', '_names', 'children_by_name', '_row', '_type_str', '_size_str', '_mtime_str',
+                 '_full_path', 'alive', 'generation', 'content', 'metadata')
+
+    def __new__(cls, *args, **kwargs):
+        # 优先复用已删除的节点，由 __init__ 重新初始化全部字段
+        if _NODE_POOL:
+            return _NODE_POOL.pop()
+        return super().__new__(cls)
+
     def __init__(self, name, isdir, parent=None):
         self.name = name
         self.isdir = isdir
         self.parent = parent
-        self.child = None
-        self.sibling_prev = None
-        self.sibling_next = None
+        self._row = 0
+        self._type_str = "目录" if isdir else "文件"
+        self._size_str = None
+        self._full_path = None
+        self.alive = True
         self.content = ""
-        self.metadata = {
-            'created': QDateTime.currentDateTime(),
-            'modified': QDateTime.currentDateTime(),
-            'size': 0
-        }
+        generation = getattr(self, 'generation', 0)
+        if generation:
+            # 来自节点池：容器已在删除时清空，原地重置而不重新分配
+            now = QDateTime.currentMSecsSinceEpoch()
+            self.metadata['created'].setMSecsSinceEpoch(now)
+            self.metadata['modified'].setMSecsSinceEpoch(now)
+            self.metadata['size'] = 0
+        else:
+            self.children = []
+            self._names = []
+            self.children_by_name = {}
+            self.metadata = {
+                'created': QDateTime.currentDateTime(),
+                'modified': QDateTime.currentDateTime(),
+                'size': 0
+            }
+        # 节点每次（重新）初始化都递增，历史记录据此识别已被复用的节点
+        self.generation = generation + 1
+        self._mtime_str = self.metadata['modified'].toString(Qt.DefaultLocaleShortDate)
 
     def full_path(self):
+        if self._full_path is not None:
+            return self._full_path
         path = []
         node = self
         while node.parent:
             path.append(node.name)
             node = node.parent
-        return '/' + '/'.join(reversed(path)) if path else '/'
+        self._full_path = '/' + '/'.join(reversed(path)) if path else '/'
+        return self._full_path
+
+    def child_row(self, name):
+        # children 按名称保持有序，_names 与其一一对应，二分查找名称应处的行
+        return bisect_left(self._names, name)
+
+    def size(self):
+        # 大小在保存时置空，需要显示时再按 UTF-8 字节数计算
+        if self.metadata['size'] is None:
+            content = self.content
+            self.metadata['size'] = len(content) if content.isascii() else len(content.encode('utf-8'))
+        return self.metadata['size']
+
+    def recycle(self):
+        if len(_NODE_POOL) < NODE_POOL_SIZE:
+            self.content = ""
+            self._full_path = None
+            self._size_str = None
+            _NODE_POOL.append(self)
+
+    def _invalidate_path_recursive(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._full_path = None
+            stack.extend(node.children)
 
 class FileSystemModel(QAbstractItemModel):
     def __init__(self, root, parent=None):
         super().__init__(parent)
         self.root = root
         self.current = root
+        self.folder_icon = QIcon('folder.png')
+        self.file_icon = QIcon('file.png')
 
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
         
         parent_node = parent.internalPointer() if parent.isValid() else self.current
-        child = parent_node.child
-        for _ in range(row):
-            child = child.sibling_next if child else None
-        return self.createIndex(row, column, child) if child else QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
 
     def parent(self, index):
         if not index.isValid():
@@ -53,30 +112,13 @@ class FileSystemModel(QAbstractItemModel):
         if parent == self.root or parent == self.current:
             return QModelIndex()
         
-        return self.createIndex(self.sibling_index(parent), 0, parent)
-
-    def sibling_index(self, node):
-        if not node.parent:
-            return 0
-        index = 0
-        current = node.parent.child
-        while current:
-            if current == node:
-                return index
-            current = current.sibling_next
-            index += 1
-        return 0
+        return self.createIndex(parent._row, 0, parent)
 
     def rowCount(self, parent=QModelIndex()):
         if parent.column() > 0:
             return 0
         parent_node = parent.internalPointer() if parent.isValid() else self.current
-        count = 0
-        child = parent_node.child
-        while child:
-            count += 1
-            child = child.sibling_next
-        return count
+        return len(parent_node.children)
 
     def columnCount(self, parent=QModelIndex()):
         return 4
@@ -92,13 +134,15 @@ class FileSystemModel(QAbstractItemModel):
             if col == 0:
                 return node.name
             elif col == 1:
-                return "目录" if node.isdir else "文件"
+                return node._type_str
             elif col == 2:
-                return node.metadata['modified'].toString(Qt.DefaultLocaleShortDate)
+                return node._mtime_str
             elif col == 3:
-                return self._format_size(node.metadata['size'])
+                if node._size_str is None:
+                    node._size_str = self._format_size(node.size())
+                return node._size_str
         elif role == Qt.DecorationRole and col == 0:
-            return QIcon('folder.png' if node.isdir else 'file.png')
+            return self.folder_icon if node.isdir else self.file_icon
         elif role == Qt.UserRole:
             return node
         
@@ -111,34 +155,81 @@ class FileSystemModel(QAbstractItemModel):
             size /= 1024
         return f"{size:.2f} TB"
 
-    def remove_node(self, parent_index, node):
+    def index_for_node(self, node):
+        if node is self.root or node is self.current:
+            return QModelIndex()
+        return self.createIndex(node._row, 0, node)
+
+    def insert_node(self, parent_index, row, node):
         parent = parent_index.internalPointer() if parent_index.isValid() else self.current
         
-        row = 0
-        current = parent.child
-        while current and current != node:
-            current = current.sibling_next
-            row += 1
+        self.beginInsertRows(parent_index, row, row)
+        
+        parent.children.insert(row, node)
+        parent._names.insert(row, node.name)
+        parent.children_by_name[node.name] = node
+        for i in range(row, len(parent.children)):
+            parent.children[i]._row = i
+        
+        self.endInsertRows()
+
+    def rename_node(self, node, new_name):
+        parent = node.parent
+        parent_index = self.index_for_node(parent)
+        children = parent.children
+        old_row = node._row
+        new_row = parent.child_row(new_name)
+        if new_row > old_row:
+            new_row -= 1
+        
+        if new_row != old_row:
+            dest_row = new_row + 1 if new_row > old_row else new_row
+            self.beginMoveRows(parent_index, old_row, old_row, parent_index, dest_row)
+        
+        del children[old_row]
+        children.insert(new_row, node)
+        del parent._names[old_row]
+        parent._names.insert(new_row, new_name)
+        for i in range(min(old_row, new_row), max(old_row, new_row) + 1):
+            children[i]._row = i
+        del parent.children_by_name[node.name]
+        parent.children_by_name[new_name] = node
+        node.name = new_name
+        
+        if new_row != old_row:
+            self.endMoveRows()
+        index = self.index_for_node(node)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def remove_node(self, parent_index, node):
+        parent = parent_index.internalPointer() if parent_index.isValid() else self.current
         
-        if not current:
+        row = node._row
+        if node.parent is not parent or row >= len(parent.children) or parent.children[row] is not node:
             return False
 
         self.beginRemoveRows(parent_index, row, row)
         
-        if node.sibling_prev:
-            node.sibling_prev.sibling_next = node.sibling_next
-        if node.sibling_next:
-            node.sibling_next.sibling_prev = node.sibling_prev
-        if parent.child == node:
-            parent.child = node.sibling_next
+        del parent.children[row]
+        del parent._names[row]
+        del parent.children_by_name[node.name]
+        for sibling in parent.children[row:]:
+            sibling._row -= 1
         
         node.parent = None
-        node.sibling_prev = None
-        node.sibling_next = None
         
         self.endRemoveRows()
         return True
 
+class FileTreeProxyModel(QSortFilterProxyModel):
+    # 目录树只显示名称列，其余列不再参与树的布局计算；不排序、不动态过滤
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDynamicSortFilter(False)
+
+    def filterAcceptsColumn(self, source_column, source_parent):
+        return source_column == 0
+
 class FileEditor(QDialog):
     def __init__(self, node, parent=None):
         super().__init__(parent)
@@ -151,7 +242,7 @@ class FileEditor(QDialog):
         # 文本编辑区域
         self.editor = QTextEdit()
         self.editor.setPlainText(node.content)
-        self.original_content = node.content
+        self.editor.document().setModified(False)
         
         # 状态栏
         self.status_bar = QStatusBar()
@@ -169,11 +260,10 @@ class FileEditor(QDialog):
         layout.addWidget(self.status_bar)
         self.setLayout(layout)
         
-        # 文本变化监测
-        self.editor.textChanged.connect(self.update_save_state)
+        # 修改状态监测（仅在状态切换时触发）
+        self.editor.document().modificationChanged.connect(self.update_save_state)
 
-    def update_save_state(self):
-        modified = self.editor.toPlainText() != self.original_content
+    def update_save_state(self, modified):
         self.save_btn.setEnabled(modified)
         self.status_bar.showMessage("* 已修改" if modified else "未修改")
 
@@ -183,9 +273,11 @@ class FileEditor(QDialog):
             self.node.content = new_content
             self.node.metadata.update({
                 'modified': QDateTime.currentDateTime(),
-                'size': len(new_content.encode('utf-8'))
+                'size': None
             })
-            self.original_content = new_content
+            self.node._size_str = None
+            self.node._mtime_str = self.node.metadata['modified'].toString(Qt.DefaultLocaleShortDate)
+            self.editor.document().setModified(False)
             self.status_bar.showMessage("保存成功！", 3000)
             self.accept()
         except Exception as e:
@@ -198,8 +290,8 @@ class FileManager(QMainWindow):
         self.current = self.root
         self.initUI()
         self.initFileSystem()
-        self.history = []
-        self.future = []
+        self.history = deque(maxlen=HISTORY_LEN)
+        self.future = deque(maxlen=HISTORY_LEN)
 
     def initFileSystem(self):
         home = self._create_node("ROOT", True, self.root)
@@ -214,14 +306,18 @@ class FileManager(QMainWindow):
         # 目录树
         self.tree = QTreeView()
         self.model = FileSystemModel(self.root)
-        self.tree.setModel(self.model)
+        self.tree_model = FileTreeProxyModel()
+        self.tree_model.setSourceModel(self.model)
+        self.tree.setModel(self.tree_model)
         self.tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.showContextMenu)
         self.tree.doubleClicked.connect(self.navigateTree)
         
-        # 文件列表
-        self.list = QListView()
+        # 文件列表（详细信息视图，显示全部列）
+        self.list = QTreeView()
         self.list.setModel(self.model)
+        self.list.setRootIsDecorated(False)
+        self.list.setItemsExpandable(False)
         self.list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list.customContextMenuRequested.connect(self.showContextMenu)
         self.list.doubleClicked.connect(self.open_selected_file)
@@ -258,56 +354,43 @@ class FileManager(QMainWindow):
 
     def _create_node(self, name, isdir, parent):
         node = FileNode(name, isdir, parent)
-        if parent.child is None:
-            parent.child = node
-        else:
-            last = parent.child
-            while last.sibling_next:
-                last = last.sibling_next
-            last.sibling_next = node
-            node.sibling_prev = last
+        self.model.insert_node(self.model.index_for_node(parent), parent.child_row(name), node)
         return node
 
     def resolve_path(self, path):
         if path.startswith('~'):
             path = '/Home' + path[1:]
         
-        current = self.root if path.startswith('/') else self.current
-        parts = [p for p in path.split('/') if p]
-        
-        for part in parts:
-            if part == '.':
-                continue
-            if part == '..':
-                if current.parent:
-                    current = current.parent
+        # 在 C 层面折叠 . 与 ..，之后只需逐级按名称查找
+        normalized = posixpath.normpath(posixpath.join(self.current.full_path(), path))
+        current = self.root
+        for part in normalized.split('/'):
+            if not part:
                 continue
-            
-            found = None
-            child = current.child
-            while child:
-                if child.name == part:
-                    found = child
-                    break
-                child = child.sibling_next
-            
-            if not found:
+            current = current.children_by_name.get(part)
+            if current is None:
                 raise FileNotFoundError(f"路径不存在: {path}")
-            current = found
         return current
 
     def refresh_view(self):
         self.model.layoutChanged.emit()
         self.tree.expandAll()
 
+    def show_current(self):
+        index = self.model.index_for_node(self.current)
+        self.list.setRootIndex(index)
+        tree_index = self.tree_model.mapFromSource(index)
+        self.tree.setCurrentIndex(tree_index)
+        self.tree.scrollTo(tree_index)
+
     def navigateTree(self, index):
         node = index.data(Qt.UserRole)
         if node and node.isdir:
-            self.history.append(self.current)
+            self._push_current(self.history)
             self.future.clear()
             self.current = node
             self.address_bar.setText(node.full_path())
-            self.refresh_view()
+            self.show_current()
 
     def open_selected_file(self, index):
         node = index.data(Qt.UserRole)
@@ -317,33 +400,45 @@ class FileManager(QMainWindow):
     def navigateAddress(self):
         try:
             node = self.resolve_path(self.address_bar.text())
-            self.history.append(self.current)
+            self._push_current(self.history)
             self.future.clear()
             self.current = node
-            self.refresh_view()
+            self.show_current()
         except Exception as e:
             QMessageBox.critical(self, "错误", str(e))
 
+    def _push_current(self, stack):
+        stack.append((self.current, self.current.generation))
+
+    def _pop_live(self, stack):
+        while stack:
+            node, generation = stack.pop()
+            if node.alive and node.generation == generation:
+                return node
+        return None
+
     def navigateBack(self):
-        if self.history:
-            self.future.append(self.current)
-            self.current = self.history.pop()
+        node = self._pop_live(self.history)
+        if node:
+            self._push_current(self.future)
+            self.current = node
             self.address_bar.setText(self.current.full_path())
-            self.refresh_view()
+            self.show_current()
 
     def navigateForward(self):
-        if self.future:
-            self.history.append(self.current)
-            self.current = self.future.pop()
+        node = self._pop_live(self.future)
+        if node:
+            self._push_current(self.history)
+            self.current = node
             self.address_bar.setText(self.current.full_path())
-            self.refresh_view()
+            self.show_current()
 
     def navigateUp(self):
         if self.current.parent:
-            self.history.append(self.current)
+            self._push_current(self.history)
             self.current = self.current.parent
             self.address_bar.setText(self.current.full_path())
-            self.refresh_view()
+            self.show_current()
 
     def showContextMenu(self, pos):
         menu = QMenu()
@@ -373,16 +468,12 @@ class FileManager(QMainWindow):
             return
         
         try:
-            child = parent_node.child
-            while child:
-                if child.name == name:
-                    raise FileExistsError("名称已存在")
-                child = child.sibling_next
+            if name in parent_node.children_by_name:
+                raise FileExistsError("名称已存在")
             
             new_node = self._create_node(name, isdir, parent_node)
             if not isdir:
                 self.open_file(new_node)  # 创建后直接打开编辑
-            self.refresh_view()
         except Exception as e:
             QMessageBox.critical(self, "错误", str(e))
 
@@ -393,10 +484,11 @@ class FileManager(QMainWindow):
         editor = FileEditor(node, self)
         if editor.exec_() == QDialog.Accepted:
             # 更新文件属性
-            index = self.model.index(0, 0, self.model.parent(self.model.createIndex(0, 0, node)))
+            index = self.model.index_for_node(node)
             self.model.dataChanged.emit(
                 index,
-                index.sibling(index.row(), 3)
+                index.sibling(index.row(), 3),
+                [Qt.DisplayRole]
             )
 
     def delete_item(self, node):
@@ -404,7 +496,7 @@ class FileManager(QMainWindow):
             QMessageBox.critical(self, "错误", "不能删除根目录")
             return
         
-        if node.isdir and node.child:
+        if node.isdir and node.children:
             reply = QMessageBox.question(self, "确认删除", 
                                        "目录包含内容，确认删除？",
                                        QMessageBox.Yes | QMessageBox.No)
@@ -413,30 +505,35 @@ class FileManager(QMainWindow):
         
         try:
             parent = node.parent
-            parent_index = self.model.index(self.model.sibling_index(parent), 0, 
-                                          self.model.parent(self.model.createIndex(0, 0, parent)))
+            parent_index = self.model.index_for_node(parent)
             
             self._delete_node(node, parent_index)
             
-            self.history = [n for n in self.history if n != node]
-            self.future = [n for n in self.future if n != node]
-            
-            if self.current == node:
+            if not self.current.alive:
                 self.current = self.root
                 self.address_bar.setText(self.current.full_path())
-            
-            self.refresh_view()
+                self.show_current()
         except Exception as e:
             QMessageBox.critical(self, "错误", str(e))
 
     def _delete_node(self, node, parent_index):
-        child = node.child
-        while child:
-            next_child = child.sibling_next
-            self._delete_node(child, self.model.index(0, 0, parent_index))
-            child = next_child
+        # 先收集整棵子树，移除子树根后再由叶到根断开引用
+        nodes = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.alive = False
+            nodes.append(current)
+            stack.extend(current.children)
         
         self.model.remove_node(parent_index, node)
+        
+        for current in reversed(nodes):
+            current.children.clear()
+            current._names.clear()
+            current.children_by_name.clear()
+            current.parent = None
+            current.recycle()
 
     def rename_item(self, node):
         new_name, ok = QInputDialog.getText(self, "重命名", 
@@ -445,13 +542,11 @@ class FileManager(QMainWindow):
             return
         
         try:
-            sibling = node.parent.child
-            while sibling:
-                if sibling != node and sibling.name == new_name:
-                    raise FileExistsError("名称已存在")
-                sibling = sibling.sibling_next
-            node.name = new_name
-            self.refresh_view()
+            siblings = node.parent.children_by_name
+            if siblings.get(new_name, node) is not node:
+                raise FileExistsError("名称已存在")
+            self.model.rename_node(node, new_name)
+            node._invalidate_path_recursive()
         except Exception as e:
             QMessageBox.critical(self, "错误", str(e))
 
@@ -462,7 +557,7 @@ class FileManager(QMainWindow):
         
         info = [
             ("名称", node.name),
-            ("类型", "目录" if node.isdir else "文件"),
+            ("类型", node._type_str),
             ("路径", node.full_path()),
             ("创建时间", node.metadata['created'].toString(Qt.DefaultLocaleLongDate)),
             ("修改时间", node.metadata['modified'].toString(Qt.DefaultLocaleLongDate))
@@ -470,7 +565,7 @@ class FileManager(QMainWindow):
         
         if not node.isdir:
             info.extend([
-                ("大小", self.model._format_size(node.metadata['size'])),
+                ("大小", self.model._format_size(node.size())),
                 ("内容预览", node.content[:100] + ("..." if len(node.content)>100 else ""))
             ])
         
@@ -3,8 +3,12 @@ from PyQt5.QtWidgets import QApplication, QMainWindow, QTreeWidget, QTreeWidgetI
 from PyQt5.QtCore import Qt
 
 FILENAME_LEN = 256
+ITEM_POOL_SIZE = 1024
 
 class FileNode:
+    __slots__ = ('filename', 'isdir', 'i_nlink', 'adr', 'parent', 'child', 'sibling_prev', 'sibling_next',
+                 'children_by_name', '_item', 'content')
+
     def __init__(self, filename, isdir, parent=None):
         self.filename = filename
         self.isdir = isdir
@@ -14,6 +18,8 @@ class FileNode:
         self.child = None
         self.sibling_prev = None
         self.sibling_next = None
+        self.children_by_name = {}
+        self._item = None
         self.content = ""  # 添加文件内容属性
 
 class Filesystem(QMainWindow):
@@ -21,6 +27,7 @@ class Filesystem(QMainWindow):
         super().__init__()
         self.root = FileNode("/", True)
         self.current_node = self.root
+        self.itemPool = []
         self.initUI()
         self.updateTree()
 
@@ -67,15 +74,29 @@ class Filesystem(QMainWindow):
         self.addTreeItems(node, self.treeWidget.invisibleRootItem())
 
     def addTreeItems(self, node, parent_item):
-        item = QTreeWidgetItem(parent_item)
+        stack = [(node, parent_item)]
+        while stack:
+            node, parent_item = stack.pop()
+            parent_item.addChild(self.newItem(node))
+            children = []
+            child = node.child
+            while child:
+                children.append((child, node._item))
+                child = child.sibling_next
+            stack.extend(reversed(children))
+
+    def newItem(self, node):
+        item = self.itemPool.pop() if self.itemPool else QTreeWidgetItem()
         item.setText(0, node.filename)
         item.setText(1, "Directory" if node.isdir else "File")
-        if node.child:
-            self.addTreeItems(node.child, item)
-        sibling = node.sibling_next
-        while sibling:
-            self.addTreeItems(sibling, parent_item)
-            sibling = sibling.sibling_next
+        item.setData(0, Qt.UserRole, node)
+        node._item = item
+        return item
+
+    def releaseItem(self, item):
+        item.setData(0, Qt.UserRole, None)
+        if len(self.itemPool) < ITEM_POOL_SIZE:
+            self.itemPool.append(item)
 
     def onSelectionChanged(self):
         selected_item = self.treeWidget.currentItem()
@@ -84,30 +105,14 @@ class Filesystem(QMainWindow):
             self.current_node = node
 
     def getNodeFromItem(self, item):
-        path = []
-        while item:
-            path.append(item.text(0))
-            item = item.parent()
-        path.reverse()
-        node = self.root
-        for name in path[1:]:  # Skip the root '/'
-            if node.child and node.child.filename == name:
-                node = node.child
-            else:
-                sibling = node.child
-                while sibling:
-                    if sibling.filename == name:
-                        node = sibling
-                        break
-                    sibling = sibling.sibling_next
-        return node
+        return item.data(0, Qt.UserRole)
 
     def onPathEntered(self):
         path = self.pathLineEdit.text()
         node = self.findNode(path)
         if node:
             self.current_node = node
-            self.updateTree(node)
+            self.treeWidget.setCurrentItem(node._item)
         else:
             QMessageBox.warning(self, "Error", "Directory not found")
 
@@ -117,17 +122,9 @@ class Filesystem(QMainWindow):
         for name in names:
             if name == "":
                 continue
-            if node.child and node.child.filename == name:
-                node = node.child
-            else:
-                sibling = node.child
-                while sibling:
-                    if sibling.filename == name:
-                        node = sibling
-                        break
-                    sibling = sibling.sibling_next
-                else:
-                    return None
+            node = node.children_by_name.get(name)
+            if node is None:
+                return None
         return node
 
     def addChildNode(self, parent_node, new_node):
@@ -135,6 +132,8 @@ class Filesystem(QMainWindow):
             new_node.sibling_next = parent_node.child
             parent_node.child.sibling_prev = new_node
         parent_node.child = new_node
+        parent_node.children_by_name[new_node.filename] = new_node
+        parent_node._item.insertChild(0, self.newItem(new_node))
 
     def onCreateDir(self):
         path = self.pathLineEdit.text()
@@ -147,11 +146,14 @@ class Filesystem(QMainWindow):
             dir_name = path
             parent_node = self.current_node
 
+        if not dir_name:
+            QMessageBox.warning(self, "Error", "Directory name is empty")
+            return
+
         if parent_node and parent_node.isdir:
-            if not self.findNode(path):
+            if dir_name not in parent_node.children_by_name:
                 new_node = FileNode(dir_name, True, parent_node)
                 self.addChildNode(parent_node, new_node)
-                self.updateTree()
             else:
                 QMessageBox.warning(self, "Error", "Directory already exists")
         else:
@@ -168,11 +170,14 @@ class Filesystem(QMainWindow):
             file_name = path
             parent_node = self.current_node
 
+        if not file_name:
+            QMessageBox.warning(self, "Error", "File name is empty")
+            return
+
         if parent_node and parent_node.isdir:
-            if not self.findNode(path):
+            if file_name not in parent_node.children_by_name:
                 new_node = FileNode(file_name, False, parent_node)
                 self.addChildNode(parent_node, new_node)
-                self.updateTree()
             else:
                 QMessageBox.warning(self, "Error", "File already exists")
         else:
@@ -191,26 +196,29 @@ class Filesystem(QMainWindow):
 
     def deleteNode(self, node):
         if node.parent:
-            if node.parent.child == node:
-                node.parent.child = node.sibling_next
-                if node.sibling_next:
-                    node.sibling_next.sibling_prev = None
+            node.parent.children_by_name.pop(node.filename, None)
+            node.parent._item.removeChild(node._item)
+            if node.sibling_prev:
+                node.sibling_prev.sibling_next = node.sibling_next
             else:
-                sibling = node.parent.child
-                while sibling and sibling.sibling_next != node:
-                    sibling = sibling.sibling_next
-                if sibling:
-                    sibling.sibling_next = node.sibling_next
-                    if node.sibling_next:
-                        node.sibling_next.sibling_prev = sibling
-        if node.child:
-            sibling = node.child
+                node.parent.child = node.sibling_next
+            if node.sibling_next:
+                node.sibling_next.sibling_prev = node.sibling_prev
+            node.sibling_prev = None
+            node.sibling_next = None
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            sibling = current.child
             while sibling:
-                next_sibling = sibling.sibling_next
-                self.deleteNode(sibling)
-                sibling = next_sibling
-        del node
-        self.updateTree()
+                stack.append(sibling)
+                sibling = sibling.sibling_next
+            current._item.takeChildren()
+            current.child = None
+            current.children_by_name.clear()
+            if current is not self.root:
+                self.releaseItem(current._item)
+                current._item = None
 
     def onEdit(self):
         selected_item = self.treeWidget.currentItem()